@@ -6,7 +6,8 @@ to compete economically. This package provides the foundational components for
 building complex AI economic simulations.
 """
 
-from .entities import Entity, Resource, Agent
+from .entities import Entity, Resource, Agent, Res
+from .effects import MoveEffect, HarvestEffect
 from .world_engine import WorldEngine
 from .economic_engine import EconomicEngine
 from .server import Server
@@ -14,4 +15,4 @@ from .server import Server
 __version__ = "2.0.0"
 __author__ = "Proxiverse Team"
 
-__all__ = ["Entity", "Resource", "Agent", "WorldEngine", "EconomicEngine", "Server"]
+__all__ = ["Entity", "Resource", "Agent", "Res", "MoveEffect", "HarvestEffect", "WorldEngine", "EconomicEngine", "Server"]
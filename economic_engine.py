@@ -6,22 +6,23 @@ such as resource spawning and component crafting.
 """
 
 import random
-from typing import List
+from typing import List, Optional
 from world_engine import WorldEngine
-from entities import Agent, Resource
+from entities import Agent, Resource, ORE, FUEL
 
 
 class EconomicEngine:
     """Manages economic activities in the simulation world."""
     
-    def __init__(self, world_engine: WorldEngine):
+    def __init__(self, world_engine: WorldEngine, seed: Optional[int] = None):
         """Initialize the EconomicEngine with a reference to the world engine.
         
         Args:
             world_engine: The WorldEngine instance to manage
+            seed: Optional seed for this engine's random generator, for repeatable runs
         """
         self.world_engine = world_engine
-        self.spawn_tick_counter = 0
+        self._rng = random.Random(seed)
         self.spawn_interval = 10  # Spawn resources every 10 ticks
     
     def spawn_resources(self, max_resources: int = 50) -> None:
@@ -31,37 +32,24 @@ class EconomicEngine:
             max_resources: Maximum number of resources allowed in the world
         """
         # Count current resources
-        current_resources = len(self.world_engine.get_entities_by_type(Resource))
+        current_resources = self.world_engine.count_resources()
         
         if current_resources >= max_resources:
             return
         
-        # Find empty cells
-        empty_cells = []
-        for x in range(self.world_engine.width):
-            for y in range(self.world_engine.height):
-                entities_here = self.world_engine.get_entity_at(x, y)
-                if not entities_here:  # Cell is empty
-                    empty_cells.append((x, y))
+        # Pick distinct empty cells without scanning the whole grid
+        rng = self._rng
+        empty_cells = self.world_engine.sample_empty_cells(max_resources - current_resources, rng)
+        count = len(empty_cells)
         
-        if not empty_cells:
-            return  # No empty cells available
+        # Draw all types and quantities up front, then insert in one batch
+        resource_types = [(ORE, FUEL)[rng.getrandbits(1)] for _ in range(count)]
+        quantities = [rng.randrange(20, 101) for _ in range(count)]  # randint(20, 100), minus a call layer
         
-        # Determine how many resources to spawn
-        resources_to_spawn = min(max_resources - current_resources, len(empty_cells))
-        
-        for _ in range(resources_to_spawn):
-            # Randomly select an empty cell
-            x, y = random.choice(empty_cells)
-            empty_cells.remove((x, y))  # Remove from available cells
-            
-            # Randomly choose resource type and quantity
-            resource_type = random.choice(["ORE", "FUEL"])
-            quantity = random.randint(20, 100)
-            
-            # Create and add the resource
-            resource = Resource(x=x, y=y, resource_type=resource_type, quantity=quantity)
-            self.world_engine.add_entity(resource, x, y)
+        self.world_engine.add_entities(
+            Resource(x=x, y=y, resource_type=resource_type, quantity=quantity)
+            for (x, y), resource_type, quantity in zip(empty_cells, resource_types, quantities)
+        )
     
     def craft_component(self, agent: Agent) -> bool:
         """Craft a component from the agent's inventory if possible.
@@ -72,30 +60,12 @@ class EconomicEngine:
         Returns:
             True if component was successfully crafted, False otherwise
         """
-        # Check if agent has required materials
-        ore_count = agent.get_inventory_count("ORE")
-        fuel_count = agent.get_inventory_count("FUEL")
-        
-        if ore_count >= 1 and fuel_count >= 1:
-            # Remove materials from inventory
-            agent.remove_from_inventory("ORE", 1)
-            agent.remove_from_inventory("FUEL", 1)
-            
-            # Add component to inventory
-            agent.add_to_inventory("COMPONENTS", 1)
-            
-            return True
-        
-        return False
+        return agent.produce_components(1) == 1
     
     def should_spawn_resources(self) -> bool:
-        """Check if it's time to spawn resources based on tick counter.
+        """Check if it's time to spawn resources based on the world tick.
         
         Returns:
             True if resources should be spawned this tick
         """
-        self.spawn_tick_counter += 1
-        if self.spawn_tick_counter >= self.spawn_interval:
-            self.spawn_tick_counter = 0
-            return True
-        return False 
\ No newline at end of file
+        return self.world_engine.current_tick % self.spawn_interval == 0
\ No newline at end of file
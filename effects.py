@@ -0,0 +1,75 @@
+"""
+Deferred world effects for Proxiverse.
+
+Agent actions can be queued as effects instead of mutating the world immediately.
+Everything queued between two ticks is read against the same world state and
+applied together at the tick boundary by WorldEngine.apply_effects. Each effect
+re-checks the state it was computed against and is dropped if that no longer holds:
+- MoveEffect: Relocate an agent from its origin cell to an absolute target cell
+- HarvestEffect: Take up to an amount from a specific resource on the agent's cell
+"""
+
+from typing import NamedTuple
+
+
+class MoveEffect(NamedTuple):
+    """Move an agent from (from_x, from_y) to (x, y), if it is still at the origin and the target is free."""
+    
+    agent_id: int
+    from_x: int
+    from_y: int
+    x: int
+    y: int
+    
+    def apply(self, world_engine) -> bool:
+        """
+        Apply the move against the current world state.
+        
+        Args:
+            world_engine: The WorldEngine instance
+        
+        Returns:
+            True if the agent was moved, False otherwise
+        """
+        agent = world_engine.entities.get(self.agent_id)
+        if agent is None:
+            return False
+        
+        # The target was worked out from the origin; stale if the agent has moved since
+        if (agent.x, agent.y) != (self.from_x, self.from_y):
+            return False
+        
+        # Earlier effects this tick may have claimed the cell
+        occupant = world_engine.get_agent_at(self.x, self.y)
+        if occupant is not None and occupant is not agent:
+            return False
+        
+        return world_engine.move_entity(agent, self.x, self.y)
+
+
+class HarvestEffect(NamedTuple):
+    """Harvest up to `amount` from a resource into an agent's inventory, if they share a cell."""
+    
+    agent_id: int
+    resource_id: int
+    amount: int
+    
+    def apply(self, world_engine) -> bool:
+        """
+        Apply the harvest against the current world state.
+        
+        Args:
+            world_engine: The WorldEngine instance
+        
+        Returns:
+            True if anything was harvested, False otherwise
+        """
+        agent = world_engine.entities.get(self.agent_id)
+        resource = world_engine.entities.get(self.resource_id)
+        if agent is None or resource is None:
+            return False  # Agent left, or another harvest depleted the resource first
+        
+        if (agent.x, agent.y) != (resource.x, resource.y):
+            return False  # An earlier effect moved the agent off the resource
+        
+        return agent.collect_from(world_engine, resource, self.amount) > 0
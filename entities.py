@@ -7,9 +7,53 @@ This module defines the fundamental entities that exist within the simulation wo
 - Agent: Represents AI-controlled entities with inventories
 """
 
-from typing import Dict, Any, Optional, List
+from enum import IntEnum
+from typing import Dict, Any, Optional, List, Union
+import array
+import itertools
 import random
-import uuid
+import sys
+
+from effects import MoveEffect, HarvestEffect
+
+
+# Canonical inventory keys, already uppercase so internal callers can skip normalization
+ORE = sys.intern('ORE')
+FUEL = sys.intern('FUEL')
+COMPONENTS = sys.intern('COMPONENTS')
+
+
+class Res(IntEnum):
+    """Slot of each resource type in an agent's inventory array."""
+    ORE = 0
+    FUEL = 1
+    COMPONENTS = 2
+
+
+# Entity kinds, tagged on each class so hot paths can test an int instead of probing attributes
+KIND_ENTITY = 0
+KIND_RESOURCE = 1
+KIND_AGENT = 2
+
+# Source of entity handles: small process-unique ints instead of UUID strings
+_id_counter = itertools.count(1)
+
+_INVENTORY_KEYS = (ORE, FUEL, COMPONENTS)  # ordered to match Res
+_STR2IDX = {key: Res(index) for index, key in enumerate(_INVENTORY_KEYS)}
+
+
+def _resource_index(resource_type: Union[Res, str]) -> int:
+    """Map a Res member or a resource name (any case) to its inventory slot."""
+    if isinstance(resource_type, Res):
+        return resource_type
+    
+    # Internal callers pass the uppercase constants; only normalize on a miss
+    index = _STR2IDX.get(resource_type)
+    if index is None:
+        index = _STR2IDX.get(resource_type.upper())
+        if index is None:
+            raise ValueError(f"Unknown resource type: {resource_type}")
+    return index
 
 
 class Entity:
@@ -19,16 +63,19 @@ class Entity:
     Every entity has a unique identifier and a position in the 2D world grid.
     """
     
-    def __init__(self, x: int, y: int, entity_id: Optional[str] = None):
+    __slots__ = ('id', 'x', 'y')
+    KIND = KIND_ENTITY
+    
+    def __init__(self, x: int, y: int, entity_id: Optional[int] = None):
         """
         Initialize an entity with position and unique ID.
         
         Args:
             x: X coordinate in the world grid
             y: Y coordinate in the world grid
-            entity_id: Optional unique identifier. If None, generates a UUID.
+            entity_id: Optional unique identifier. If None, the next free handle is used.
         """
-        self.id = entity_id or str(uuid.uuid4())
+        self.id = entity_id if entity_id is not None else next(_id_counter)
         self.x = x
         self.y = y
     
@@ -38,7 +85,7 @@ class Entity:
         self.y = y
     
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(id={self.id[:8]}..., x={self.x}, y={self.y})"
+        return f"{self.__class__.__name__}(id={self.id}, x={self.x}, y={self.y})"
 
 
 class Resource(Entity):
@@ -49,7 +96,10 @@ class Resource(Entity):
     Examples include ORE, FUEL, and COMPONENTS.
     """
     
-    def __init__(self, x: int, y: int, resource_type: str, quantity: int, entity_id: Optional[str] = None):
+    __slots__ = ('resource_type', 'quantity')
+    KIND = KIND_RESOURCE
+    
+    def __init__(self, x: int, y: int, resource_type: str, quantity: int, entity_id: Optional[int] = None):
         """
         Initialize a resource entity.
         
@@ -59,9 +109,13 @@ class Resource(Entity):
             resource_type: Type of resource (e.g., 'ORE', 'FUEL', 'COMPONENTS')
             quantity: Amount of this resource
             entity_id: Optional unique identifier
+            
+        Raises:
+            ValueError: If resource_type has no inventory slot
         """
         super().__init__(x, y, entity_id)
-        self.resource_type = resource_type.upper()
+        # Normalized up front, so unknown types fail here rather than mid-harvest
+        self.resource_type = _INVENTORY_KEYS[_resource_index(resource_type)]
         self.quantity = quantity
     
     def harvest(self, amount: int) -> int:
@@ -83,7 +137,7 @@ class Resource(Entity):
         return self.quantity <= 0
     
     def __repr__(self) -> str:
-        return f"Resource(id={self.id[:8]}..., type={self.resource_type}, qty={self.quantity}, x={self.x}, y={self.y})"
+        return f"Resource(id={self.id}, type={self.resource_type}, qty={self.quantity}, x={self.x}, y={self.y})"
 
 
 class Agent(Entity):
@@ -94,7 +148,10 @@ class Agent(Entity):
     Each agent has an inventory to store collected resources.
     """
     
-    def __init__(self, x: int, y: int, name: str, entity_id: Optional[str] = None):
+    __slots__ = ('name', '_inventory')
+    KIND = KIND_AGENT
+    
+    def __init__(self, x: int, y: int, name: str, entity_id: Optional[int] = None):
         """
         Initialize an agent.
         
@@ -106,65 +163,58 @@ class Agent(Entity):
         """
         super().__init__(x, y, entity_id)
         self.name = name
-        self.inventory: Dict[str, int] = {}  # resource_type -> quantity
+        self._inventory = array.array('i', [0] * len(Res))  # quantities indexed by Res
+    
+    @property
+    def inventory(self) -> Dict[str, int]:
+        """Inventory as a resource_type -> quantity dict of the non-empty entries."""
+        return {key: count for key, count in zip(_INVENTORY_KEYS, self._inventory) if count}
     
-    def add_to_inventory(self, resource_type: str, quantity: int) -> None:
+    def add_to_inventory(self, resource_type: Union[Res, str], quantity: int) -> None:
         """
         Add resources to the agent's inventory.
         
         Args:
-            resource_type: Type of resource to add
+            resource_type: Type of resource to add (a Res member or its name)
             quantity: Amount to add
         """
-        resource_type = resource_type.upper()
-        if resource_type in self.inventory:
-            self.inventory[resource_type] += quantity
-        else:
-            self.inventory[resource_type] = quantity
+        self._inventory[_resource_index(resource_type)] += quantity
     
-    def remove_from_inventory(self, resource_type: str, quantity: int) -> int:
+    def remove_from_inventory(self, resource_type: Union[Res, str], quantity: int) -> int:
         """
         Remove resources from the agent's inventory.
         
         Args:
-            resource_type: Type of resource to remove
+            resource_type: Type of resource to remove (a Res member or its name)
             quantity: Amount to remove
             
         Returns:
             Actual amount removed (may be less than requested)
         """
-        resource_type = resource_type.upper()
-        if resource_type not in self.inventory:
-            return 0
-        
-        available = self.inventory[resource_type]
-        removed = min(quantity, available)
-        self.inventory[resource_type] -= removed
-        
-        # Clean up empty entries
-        if self.inventory[resource_type] == 0:
-            del self.inventory[resource_type]
-        
+        index = _resource_index(resource_type)
+        removed = min(quantity, self._inventory[index])
+        self._inventory[index] -= removed
         return removed
     
-    def get_inventory_count(self, resource_type: str) -> int:
+    def get_inventory_count(self, resource_type: Union[Res, str]) -> int:
         """
         Get the quantity of a specific resource in inventory.
         
         Args:
-            resource_type: Type of resource to check
+            resource_type: Type of resource to check (a Res member or its name)
             
         Returns:
             Quantity of the resource (0 if not present)
         """
-        return self.inventory.get(resource_type.upper(), 0)
+        return self._inventory[_resource_index(resource_type)]
     
     def can_produce_components(self) -> bool:
         """
         Check if agent has enough resources to produce components.
         Requires at least 1 ORE and 1 FUEL.
         """
-        return self.get_inventory_count('ORE') >= 1 and self.get_inventory_count('FUEL') >= 1
+        inventory = self._inventory
+        return inventory[Res.ORE] >= 1 and inventory[Res.FUEL] >= 1
     
     def produce_components(self, quantity: int = 1) -> int:
         """
@@ -176,18 +226,15 @@ class Agent(Entity):
         Returns:
             Actual number of components produced
         """
-        max_producible = min(
-            self.get_inventory_count('ORE'),
-            self.get_inventory_count('FUEL'),
-            quantity
-        )
+        inventory = self._inventory
+        produced = min(inventory[Res.ORE], inventory[Res.FUEL], quantity)
         
-        if max_producible > 0:
-            self.remove_from_inventory('ORE', max_producible)
-            self.remove_from_inventory('FUEL', max_producible)
-            self.add_to_inventory('COMPONENTS', max_producible)
+        if produced > 0:
+            inventory[Res.ORE] -= produced
+            inventory[Res.FUEL] -= produced
+            inventory[Res.COMPONENTS] += produced
         
-        return max_producible
+        return produced
     
     def move(self, world_engine, dx: int, dy: int) -> bool:
         """
@@ -205,17 +252,13 @@ class Agent(Entity):
         new_x = self.x + dx
         new_y = self.y + dy
         
-        # Check if new position is within bounds
+        # Check bounds, then refuse cells held by another agent (resources are fine)
         if not world_engine.is_valid_position(new_x, new_y):
             return False
         
-        # Check what's at the target position
-        entities_at_target = world_engine.get_entity_at(new_x, new_y)
-        
-        # Allow movement if cell is empty or only contains resources
-        for entity in entities_at_target:
-            if hasattr(entity, 'name') and entity.id != self.id:  # This is another agent (not self)
-                return False  # Can't move to cell with another agent
+        occupant = world_engine.get_agent_at(new_x, new_y)
+        if occupant is not None and occupant is not self:
+            return False  # Can't move to cell with another agent
         
         # Move the agent
         world_engine.move_entity(self, new_x, new_y)
@@ -234,21 +277,74 @@ class Agent(Entity):
         entities_here = world_engine.get_entity_at(self.x, self.y)
         
         for entity in entities_here:
-            if hasattr(entity, 'resource_type') and hasattr(entity, 'harvest'):
-                # This is a resource entity
-                harvested_amount = entity.harvest(10)  # Harvest up to 10 units
-                if harvested_amount > 0:
-                    self.add_to_inventory(entity.resource_type, harvested_amount)
-                    
-                    # Remove depleted resources from world
-                    if entity.is_depleted():
-                        world_engine.remove_entity(entity)
-                    
+            if entity.KIND == KIND_RESOURCE:
+                if self.collect_from(world_engine, entity, 10) > 0:  # Harvest up to 10 units
                     return True
         
         return False
     
-
+    def collect_from(self, world_engine, resource: Resource, amount: int) -> int:
+        """
+        Harvest from a resource into this agent's inventory.
+        
+        Args:
+            world_engine: The WorldEngine instance
+            resource: The resource to harvest from
+            amount: Desired amount to harvest
+            
+        Returns:
+            Actual amount harvested
+        """
+        # Resolve the slot before touching the resource, so a bad type can't lose quantity
+        index = _resource_index(resource.resource_type)
+        harvested_amount = resource.harvest(amount)
+        if harvested_amount > 0:
+            self._inventory[index] += harvested_amount
+            
+            # Remove depleted resources from world
+            if resource.is_depleted():
+                world_engine.remove_entity(resource)
+        
+        return harvested_amount
+    
+    def queue_move(self, world_engine, dx: int, dy: int) -> bool:
+        """
+        Queue a move by the specified delta, to be applied at the next tick.
+        
+        Collisions with other agents are resolved when effects are applied.
+        
+        Args:
+            world_engine: The WorldEngine instance
+            dx: Change in x coordinate
+            dy: Change in y coordinate
+            
+        Returns:
+            True if the move was queued, False if the target is out of bounds
+        """
+        new_x = self.x + dx
+        new_y = self.y + dy
+        if not world_engine.is_valid_position(new_x, new_y):
+            return False
+        
+        world_engine.queue_effect(MoveEffect(self.id, self.x, self.y, new_x, new_y))
+        return True
+    
+    def queue_harvest(self, world_engine) -> bool:
+        """
+        Queue a harvest of the resource at the agent's position, applied at the next tick.
+        
+        Args:
+            world_engine: The WorldEngine instance
+            
+        Returns:
+            True if a harvest was queued, False if there is nothing to harvest here
+        """
+        for entity in world_engine.get_entity_at(self.x, self.y):
+            if entity.KIND == KIND_RESOURCE and not entity.is_depleted():
+                world_engine.queue_effect(HarvestEffect(self.id, entity.id, 10))
+                return True
+        
+        return False
     
     def __repr__(self) -> str:
-        return f"Agent(id={self.id[:8]}..., name={self.name}, x={self.x}, y={self.y}, inventory={self.inventory})"
+        return f"Agent(id={self.id}, name={self.name}, x={self.x}, y={self.y}, inventory={self.inventory})"
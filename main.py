@@ -13,6 +13,12 @@ from server import Server
 from http_server import run_http_server
 from entities import Resource
 
+try:
+    import uvloop  # optional, faster event loop on Linux/macOS
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    _loop_factory = None  # asyncio's default loop
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,35 +27,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Initial resources scattered around, including near spawn point: (x, y, type, quantity)
+_INITIAL_RESOURCES = (
+    (3, 3, "ORE", 80),
+    (16, 4, "FUEL", 70),
+    (2, 15, "ORE", 90),
+    (18, 16, "FUEL", 60),
+    (5, 8, "ORE", 75),
+    (15, 12, "FUEL", 85),
+    (8, 2, "ORE", 65),
+    (12, 18, "FUEL", 80),
+    (1, 10, "ORE", 70),
+    (19, 8, "FUEL", 75),
+    # Add resources near spawn point (10, 10)
+    (11, 10, "ORE", 50),  # Right next to spawn
+    (10, 11, "FUEL", 40),  # Below spawn
+    (9, 10, "ORE", 60),    # Left of spawn
+    (10, 9, "FUEL", 55),   # Above spawn
+)
+
+
 def create_initial_world():
     """Create the initial world with some starting resources."""
     # Create a larger world for multiplayer
     world = WorldEngine(width=20, height=20)
     
-    # Add some initial resources scattered around, including near spawn point
-    initial_resources = [
-        (3, 3, "ORE", 80),
-        (16, 4, "FUEL", 70),
-        (2, 15, "ORE", 90),
-        (18, 16, "FUEL", 60),
-        (5, 8, "ORE", 75),
-        (15, 12, "FUEL", 85),
-        (8, 2, "ORE", 65),
-        (12, 18, "FUEL", 80),
-        (1, 10, "ORE", 70),
-        (19, 8, "FUEL", 75),
-        # Add resources near spawn point (10, 10)
-        (11, 10, "ORE", 50),  # Right next to spawn
-        (10, 11, "FUEL", 40),  # Below spawn
-        (9, 10, "ORE", 60),    # Left of spawn
-        (10, 9, "FUEL", 55),   # Above spawn
-    ]
+    added = world.add_entities(
+        Resource(x=x, y=y, resource_type=resource_type, quantity=quantity)
+        for x, y, resource_type, quantity in _INITIAL_RESOURCES
+    )
     
-    for x, y, resource_type, quantity in initial_resources:
-        resource = Resource(x=x, y=y, resource_type=resource_type, quantity=quantity)
-        world.add_entity(resource, x, y)
-    
-    logger.info(f"Created initial world with {len(initial_resources)} resource deposits")
+    logger.info(f"Created initial world with {added} resource deposits")
     return world
 
 
@@ -69,13 +77,22 @@ async def simulation_loop(world_engine: WorldEngine, economic_engine: EconomicEn
     tick_interval = 1.0 / tick_rate
     tick_count = 0
     
+    # Pace ticks against absolute deadlines so time spent working doesn't accumulate as drift
+    loop = asyncio.get_running_loop()
+    next_deadline = loop.time()
+    
+    # Bind per-tick callables once so the loop body avoids repeated attribute lookups
+    tick = world_engine.tick
+    now = loop.time
+    sleep = asyncio.sleep
+    
     try:
         while True:
             # Actions are now processed immediately when received
             # No need to process action queue here
             
             # Advance the world simulation
-            world_engine.tick(economic_engine)
+            tick(economic_engine)
             
             # Send world state updates to all clients (disabled to prevent interference)
             # await server.broadcast_world_state()
@@ -89,8 +106,16 @@ async def simulation_loop(world_engine: WorldEngine, economic_engine: EconomicEn
                           f"Agents: {world_state['agents']}, "
                           f"Resources: {world_state['resources']}")
             
-            # Wait for next tick
-            await asyncio.sleep(tick_interval)
+            # Wait for next tick, sleeping only for what's left of the interval
+            next_deadline += tick_interval
+            delay = next_deadline - now()
+            if delay > 0:
+                await sleep(delay)
+            else:
+                # Overran: start the next tick now and re-anchor instead of bursting to catch up
+                logger.warning("Tick overrun by %.3fs", -delay)
+                next_deadline = now()
+                await sleep(0)
             
     except asyncio.CancelledError:
         logger.info("Simulation loop cancelled")
@@ -131,10 +156,9 @@ async def run_server(host: str = "localhost", port: int = 8765, tick_rate: float
         logger.info(f"📊 Status page: http://{host}:{port + 1}")
         
         # Run all servers and simulation concurrently
-        await asyncio.gather(
-            server.server.wait_closed(),  # Keep WebSocket server running
-            simulation_loop(world, economic_engine, server, tick_rate)
-        )
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(server.server.wait_closed())  # Keep WebSocket server running
+            tg.create_task(simulation_loop(world, economic_engine, server, tick_rate))
         
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
@@ -151,11 +175,18 @@ def main():
     """Main entry point for the Proxiverse server."""
     try:
         # Run the async server
-        asyncio.run(run_server(
-            host="localhost",
-            port=8765,
-            tick_rate=1.0  # 1 tick per second
-        ))
+        with asyncio.Runner(loop_factory=_loop_factory) as runner:
+            # Eager tasks (Python 3.12+) start running inside create_task, skipping a
+            # loop round-trip for coroutines that finish without blocking
+            eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+            if eager_task_factory is not None:
+                runner.get_loop().set_task_factory(eager_task_factory)
+            
+            runner.run(run_server(
+                host="localhost",
+                port=8765,
+                tick_rate=1.0  # 1 tick per second
+            ))
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -9,7 +9,7 @@ import asyncio
 import json
 import websockets
 import logging
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Optional
 from websockets.server import WebSocketServerProtocol
 from websockets.exceptions import InvalidUpgrade
 
@@ -17,6 +17,61 @@ from world_engine import WorldEngine
 from economic_engine import EconomicEngine
 from entities import Agent
 
+try:
+    import orjson
+    
+    _loads = orjson.loads  # accepts str or bytes; its errors subclass json.JSONDecodeError
+    
+    def _dumps(data) -> str:
+        """Encode a message as JSON text (orjson, decoded so frames stay text frames)."""
+        return orjson.dumps(data).decode('utf-8')
+except ImportError:  # orjson is optional
+    _loads = json.loads
+    _dumps = json.dumps
+
+
+def _error_message(message: str) -> str:
+    """Encode an error message for a client."""
+    return _dumps({"type": "error", "message": message})
+
+
+class InvalidParams(ValueError):
+    """Raised when an action's params fail validation."""
+
+
+def _move_params(params: Dict) -> tuple:
+    """Validate the params of a move action.
+    
+    Args:
+        params: The action's params object
+        
+    Returns:
+        The (dx, dy) offsets, each defaulting to 0
+        
+    Raises:
+        InvalidParams: If dx or dy is present but not an integer
+    """
+    dx = params.get("dx", 0)
+    dy = params.get("dy", 0)
+    # bool is an int subclass, so compare exact types
+    if type(dx) is not int or type(dy) is not int:
+        raise InvalidParams("dx and dy must be integers")
+    return dx, dy
+
+
+# Fixed-content replies, encoded once at import
+_ERR_NOT_REGISTERED = _error_message("Not registered")
+_ERR_INVALID_JSON = _error_message("Invalid JSON format")
+_ERR_INVALID_PARAMS = _error_message("Invalid params: expected an object")
+_ERR_INTERNAL = _error_message("Internal server error")
+# Message heads, unterminated so the shared state fields can follow
+_GAME_STATE_HEAD = _dumps({"type": "game_state"})[:-1] + ','
+_ACTION_CONFIRMED_HEAD = {
+    (action, success): _dumps({"type": "action_confirmed", "action": action, "success": success})[:-1] + ','
+    for action in ("move", "harvest", "craft")
+    for success in (True, False)
+}
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,13 +97,51 @@ class Server:
         self.port = port
         
         # Track client connections and their associated agents
-        self.connections: Dict[WebSocketServerProtocol, str] = {}  # websocket -> agent_id
-        self.agents: Dict[str, Agent] = {}  # agent_id -> agent
-        self.action_queue: asyncio.Queue = asyncio.Queue()
+        self._ws_agent: Dict[WebSocketServerProtocol, Agent] = {}  # websocket -> agent
+        self._agent_by_id: Dict[int, Agent] = {}  # agent_id -> agent, for queued actions
+        # Bounded so a flood of actions applies back-pressure to producers instead of growing without limit
+        self.action_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._fields_cache = (None, None)  # (world summary, encoded state fields)
+        self._ws_cache = (None, None)  # ((tick, world revision), world_state)
+        self._last_client_hash: Dict[WebSocketServerProtocol, tuple] = {}  # websocket -> last broadcast key
         
         self.server = None
+        self._status_html_cache = (None, None)  # ((tick, resources, connections), page bytes)
+        self._build_status_html()
         
-    async def register_client(self, websocket: WebSocketServerProtocol) -> str:
+        # Action dispatch tables: immediate (per-message replies) and tick-deferred (action queue)
+        self._handlers = {
+            "move": self._do_move,
+            "harvest": self._do_harvest,
+            "craft": self._do_craft,
+        }
+        self._queued_handlers = {
+            "move": self._queue_move,
+            "harvest": self._queue_harvest,
+            "craft": self._do_craft,
+        }
+    
+    def _do_move(self, agent: Agent, params: Dict) -> bool:
+        """Move an agent immediately."""
+        return agent.move(self.world_engine, *_move_params(params))
+    
+    def _do_harvest(self, agent: Agent, params: Dict) -> bool:
+        """Harvest at the agent's position immediately."""
+        return agent.harvest(self.world_engine)
+    
+    def _do_craft(self, agent: Agent, params: Dict) -> bool:
+        """Craft a component from the agent's inventory."""
+        return self.economic_engine.craft_component(agent)
+    
+    def _queue_move(self, agent: Agent, params: Dict) -> bool:
+        """Queue a move for the next tick."""
+        return agent.queue_move(self.world_engine, *_move_params(params))
+    
+    def _queue_harvest(self, agent: Agent, params: Dict) -> bool:
+        """Queue a harvest for the next tick."""
+        return agent.queue_harvest(self.world_engine)
+
+    async def register_client(self, websocket: WebSocketServerProtocol) -> int:
         """Register a new client connection and create an agent for them.
         
         Args:
@@ -62,17 +155,17 @@ class Server:
         spawn_y = self.world_engine.height // 2
         
         # Create new agent for this client
-        agent_name = f"RemoteAgent_{len(self.connections) + 1}"
+        agent_name = f"RemoteAgent_{len(self._ws_agent) + 1}"
         agent = Agent(x=spawn_x, y=spawn_y, name=agent_name)
         
         # Add agent to world
         self.world_engine.add_entity(agent, spawn_x, spawn_y)
         
         # Track the connection and agent
-        self.connections[websocket] = agent.id
-        self.agents[agent.id] = agent
+        self._ws_agent[websocket] = agent
+        self._agent_by_id[agent.id] = agent
         
-        logger.info(f"Client connected: {agent_name} (ID: {agent.id[:8]}...) at ({spawn_x}, {spawn_y})")
+        logger.info(f"Client connected: {agent_name} (ID: {agent.id}) at ({spawn_x}, {spawn_y})")
         
         return agent.id
     
@@ -82,17 +175,33 @@ class Server:
         Args:
             websocket: The WebSocket connection to unregister
         """
-        if websocket in self.connections:
-            agent_id = self.connections[websocket]
-            agent = self.agents.get(agent_id)
+        for agent in self._unregister_many((websocket,)):
+            logger.info(f"Agent {agent.name} (ID: {agent.id}) disconnected and removed")
+    
+    def _unregister_many(self, connections) -> List[Agent]:
+        """Unregister several client connections in one pass and remove their agents.
+        
+        Args:
+            connections: The WebSocket connections to unregister
             
+        Returns:
+            The agents that were removed
+        """
+        ws_agent = self._ws_agent
+        agent_by_id = self._agent_by_id
+        last_hash = self._last_client_hash
+        remove_entity = self.world_engine.remove_entity
+        removed = []
+        
+        for websocket in connections:
+            last_hash.pop(websocket, None)
+            agent = ws_agent.pop(websocket, None)
             if agent:
                 # Remove agent from world
-                self.world_engine.remove_entity(agent)
-                del self.agents[agent_id]
-                logger.info(f"Agent {agent.name} (ID: {agent_id[:8]}...) disconnected and removed")
-            
-            del self.connections[websocket]
+                remove_entity(agent)
+                agent_by_id.pop(agent.id, None)
+                removed.append(agent)
+        return removed
     
     async def handle_client_message(self, websocket: WebSocketServerProtocol, message: str):
         """Handle incoming message from a client.
@@ -102,179 +211,194 @@ class Server:
             message: The JSON message from the client
         """
         try:
-            data = json.loads(message)
-            agent_id = self.connections.get(websocket)
+            data = _loads(message)
+            agent = self._ws_agent.get(websocket)
             
-            if not agent_id:
-                await websocket.send(json.dumps({
-                    "type": "error",
-                    "message": "Not registered"
-                }))
+            if agent is None:
+                await websocket.send(_ERR_NOT_REGISTERED)
                 return
             
             action = data.get("action")
-            params = data.get("params", {})
-            
-            agent = self.agents.get(agent_id)
-            if not agent:
-                await websocket.send(json.dumps({
-                    "type": "error",
-                    "message": "Agent not found"
-                }))
+            params = data.get("params")
+            if params is None:
+                params = {}
+            elif not isinstance(params, dict):
+                await websocket.send(_ERR_INVALID_PARAMS)
                 return
             
             # Process action and send response
             try:
-                logger.info(f"Processing action: {action} with params: {params}")
+                debug = logger.isEnabledFor(logging.DEBUG)
+                if debug:
+                    logger.debug("Processing action: %s with params: %s", action, params)
                 
-                success = False
-                if action == "move":
-                    dx = params.get("dx", 0)
-                    dy = params.get("dy", 0)
-                    success = agent.move(self.world_engine, dx, dy)
-                    logger.info(f"Agent {agent.name} moved to ({agent.x}, {agent.y}) - Success: {success}")
-                    
-                elif action == "harvest":
-                    success = agent.harvest(self.world_engine)
-                    logger.info(f"Agent {agent.name} harvested at ({agent.x}, {agent.y}) - Success: {success}")
-                    
-                elif action == "craft":
-                    success = self.economic_engine.craft_component(agent)
-                    logger.info(f"Agent {agent.name} crafted component - Success: {success}")
-                else:
+                # Non-string actions (lists, objects) can't be dict keys; treat them as unknown
+                handler = self._handlers.get(action) if isinstance(action, str) else None
+                if handler is None:
                     logger.warning(f"Unknown action: {action}")
-                    await websocket.send(json.dumps({
-                        "type": "error",
-                        "message": f"Unknown action: {action}"
-                    }))
+                    await websocket.send(_error_message(f"Unknown action: {action}"))
                     return
                 
-                # ALWAYS send action_confirmed first
-                logger.info(f"Sending action_confirmed for {action}")
-                await websocket.send(json.dumps({
-                    "type": "action_confirmed",
-                    "action": action,
-                    "success": success
-                }))
+                success = handler(agent, params)
+                if debug:
+                    logger.debug("Agent %s %s at (%d, %d) - Success: %s",
+                                 agent.name, action, agent.x, agent.y, success)
                 
-                # ALWAYS send game_state second
-                logger.info(f"Sending game_state for {action}")
-                world_state = self.world_engine.get_world_state()
-                state_update = {
-                    "type": "game_state",
-                    "tick": world_state["tick"],
-                    "agent_state": {
-                        "id": agent.id,
-                        "name": agent.name,
-                        "x": agent.x,
-                        "y": agent.y,
-                        "inventory": agent.inventory
-                    },
-                    "world_info": {
-                        "dimensions": world_state["dimensions"],
-                        "total_entities": world_state["entity_count"],
-                        "total_agents": world_state["agents"],
-                        "total_resources": world_state["resources"]
-                    }
-                }
-                await websocket.send(json.dumps(state_update))
-                logger.info(f"Completed processing action: {action}")
+                # Confirm the action and report the resulting state in a single frame
+                fields = self._state_fields(self._cached_world_state())
+                await websocket.send(_ACTION_CONFIRMED_HEAD[action, bool(success)] + fields
+                                     + _dumps(self._agent_state(agent)) + '}')
+                if debug:
+                    logger.debug("Completed processing action: %s", action)
                 
+            except InvalidParams as e:
+                await websocket.send(_error_message(f"Invalid params: {e}"))
             except Exception as e:
                 logger.error(f"Error processing action {action}: {e}")
-                await websocket.send(json.dumps({
-                    "type": "error",
-                    "message": f"Action failed: {e}"
-                }))
+                await websocket.send(_error_message(f"Action failed: {e}"))
             
         except json.JSONDecodeError:
-            await websocket.send(json.dumps({
-                "type": "error", 
-                "message": "Invalid JSON format"
-            }))
+            await websocket.send(_ERR_INVALID_JSON)
         except Exception as e:
             logger.error(f"Error handling client message: {e}")
-            await websocket.send(json.dumps({
-                "type": "error",
-                "message": "Internal server error"
-            }))
+            await websocket.send(_ERR_INTERNAL)
     
-    async def broadcast_world_state(self):
-        """Send world state updates to all connected clients."""
-        if not self.connections:
-            return
-        
-        # Prepare world state data
+    def _cached_world_state(self) -> Dict:
+        """Get the world state, rebuilt only when the tick or world contents change."""
+        key = (self.world_engine.current_tick, self.world_engine.revision)
+        cached_key, cached = self._ws_cache
+        if cached_key == key:
+            return cached
         world_state = self.world_engine.get_world_state()
+        self._ws_cache = (key, world_state)
+        return world_state
+    
+    @staticmethod
+    def _agent_state(agent: Agent) -> dict:
+        """Build the per-agent part of a game_state message."""
+        return {
+            "id": agent.id,
+            "name": agent.name,
+            "x": agent.x,
+            "y": agent.y,
+            "inventory": agent.inventory
+        }
+    
+    def _state_fields(self, world_state: Dict) -> str:
+        """Get the world-derived fields shared by state messages as a JSON fragment.
         
-        # Create a copy of connections to avoid modification during iteration
-        connections_copy = list(self.connections.items())
-        disconnected_clients = []
+        The result is the inside of a JSON object ending with '"agent_state":', so
+        callers prepend a message head such as _GAME_STATE_HEAD and append an
+        encoded agent state and a closing brace. It is cached until the world
+        summary changes.
         
-        for websocket, agent_id in connections_copy:
-            try:
-                agent = self.agents.get(agent_id)
-                if not agent:
-                    continue
-                
-                # Create personalized state update
-                update = {
-                    "type": "game_state",
-                    "tick": world_state["tick"],
-                    "agent_state": {
-                        "id": agent.id,
-                        "name": agent.name,
-                        "x": agent.x,
-                        "y": agent.y,
-                        "inventory": agent.inventory
-                    },
-                    "world_info": {
-                        "dimensions": world_state["dimensions"],
-                        "total_entities": world_state["entity_count"],
-                        "total_agents": world_state["agents"],
-                        "total_resources": world_state["resources"]
-                    }
+        Args:
+            world_state: Snapshot from WorldEngine.get_world_state()
+        """
+        key = (world_state["tick"], world_state["entity_count"],
+               world_state["agents"], world_state["resources"])
+        if self._fields_cache[0] != key:
+            shared = _dumps({
+                "tick": world_state["tick"],
+                "world_info": {
+                    "dimensions": world_state["dimensions"],
+                    "total_entities": world_state["entity_count"],
+                    "total_agents": world_state["agents"],
+                    "total_resources": world_state["resources"]
                 }
-                
-                await websocket.send(json.dumps(update))
-                
-            except websockets.exceptions.ConnectionClosed:
+            })
+            self._fields_cache = (key, shared[1:-1] + ',"agent_state":')
+        return self._fields_cache[1]
+    
+    async def broadcast_world_state(self, force: bool = False):
+        """Send world state updates to all connected clients.
+        
+        Clients whose agent and world summary are unchanged since their last
+        broadcast are skipped, so an idle world costs no encoding or bandwidth.
+        
+        Args:
+            force: Send to every client regardless, e.g. as a periodic keepalive
+        """
+        if not self._ws_agent:
+            return
+        
+        # Prepare world state data, serialized once for every client
+        world_state = self._cached_world_state()
+        envelope = _GAME_STATE_HEAD + self._state_fields(world_state)
+        summary = (world_state["entity_count"], world_state["agents"], world_state["resources"])
+        
+        # Build every payload first; the connection maps may change once we await
+        last_hash = self._last_client_hash
+        prepared = []
+        for websocket, agent in self._ws_agent.items():
+            client_hash = (summary, agent.x, agent.y, tuple(agent.inventory.items()))
+            if not force and last_hash.get(websocket) == client_hash:
+                continue
+            last_hash[websocket] = client_hash
+            # Only the agent_state fragment differs between clients
+            prepared.append((websocket, envelope + _dumps(self._agent_state(agent)) + '}'))
+        
+        if not prepared:
+            return
+        
+        # Send to all clients concurrently so one slow socket doesn't delay the rest
+        results = await asyncio.gather(
+            *(websocket.send(payload) for websocket, payload in prepared),
+            return_exceptions=True
+        )
+        
+        disconnected_clients = []
+        for (websocket, _), result in zip(prepared, results):
+            if isinstance(result, websockets.exceptions.ConnectionClosed):
                 disconnected_clients.append(websocket)
-            except Exception as e:
-                logger.error(f"Error sending state to client: {e}")
+            elif isinstance(result, Exception):
+                logger.error(f"Error sending state to client: {result}")
                 disconnected_clients.append(websocket)
         
         # Clean up disconnected clients
-        for websocket in disconnected_clients:
-            await self.unregister_client(websocket)
+        if disconnected_clients:
+            removed = self._unregister_many(disconnected_clients)
+            if removed:
+                logger.info("Removed %d disconnected agents: %s",
+                            len(removed), ", ".join(agent.name for agent in removed))
     
     async def process_action_queue(self):
-        """Process all pending actions from the action queue."""
+        """Process all pending actions from the action queue as one batch.
+        
+        Not wired up yet: nothing puts actions on action_queue or calls this method.
+        Client messages go through handle_client_message, which applies them immediately.
+        """
         actions_processed = 0
         
-        while not self.action_queue.empty():
+        # Take everything queued so far in one synchronous pass; later puts wait for the next tick
+        queue = self.action_queue
+        pending = []
+        while True:
+            try:
+                pending.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        
+        # Handled in arrival order, keeping each agent's own sequence: effects check the
+        # position they were queued from, so reordering a move and a harvest changes results.
+        # Each item is checked inside the try, so one malformed entry can't sink the batch.
+        for action_data in pending:
             try:
-                action_data = await self.action_queue.get()
                 agent_id = action_data["agent_id"]
                 action = action_data["action"]
                 params = action_data["params"]
                 
-                agent = self.agents.get(agent_id)
+                agent = self._agent_by_id.get(agent_id)
                 if not agent:
                     logger.warning(f"Agent {agent_id} not found for action {action}")
                     continue
                 
-                # Process different action types
-                if action == "move":
-                    dx = params.get("dx", 0)
-                    dy = params.get("dy", 0)
-                    agent.move(self.world_engine, dx, dy)
-                    
-                elif action == "harvest":
-                    agent.harvest(self.world_engine)
-                    
-                elif action == "craft":
-                    self.economic_engine.craft_component(agent)
+                # World-changing actions are queued; the next tick applies them together
+                handler = self._queued_handlers.get(action) if isinstance(action, str) else None
+                if handler is None:
+                    logger.warning(f"Unknown action: {action}")
+                    continue
+                handler(agent, params)
                 
                 actions_processed += 1
                 
@@ -282,7 +406,7 @@ class Server:
                 logger.error(f"Error processing action: {e}")
         
         if actions_processed > 0:
-            logger.debug(f"Processed {actions_processed} actions")
+            logger.debug("Processed %d actions", actions_processed)
     
     async def handle_client(self, websocket: WebSocketServerProtocol):
         """Handle a single client connection.
@@ -300,7 +424,7 @@ class Server:
                 "agent_id": agent_id,
                 "message": "Connected to Proxiverse server"
             }
-            await websocket.send(json.dumps(welcome_msg))
+            await websocket.send(_dumps(welcome_msg))
             
             # Handle incoming messages
             async for message in websocket:
@@ -330,10 +454,9 @@ class Server:
         logger.info("Use test_client.py or a WebSocket client to connect")
         return self.server
     
-    def _get_status_html(self):
-        """Generate a simple status HTML page."""
-        world_state = self.world_engine.get_world_state()
-        return f"""
+    def _build_status_html(self):
+        """Encode the fixed parts of the status page once, around its live stats."""
+        self._status_html_prefix = f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -350,10 +473,8 @@ class Server:
             <div class="status">
                 <h2>Server Status: <span class="connected">🟢 Online</span></h2>
                 <p><strong>WebSocket URL:</strong> <code>ws://{self.host}:{self.port}/ws</code></p>
-                <p><strong>Connected Agents:</strong> {len(self.connections)}</p>
-                <p><strong>World Tick:</strong> {world_state['tick']}</p>
-                <p><strong>Total Resources:</strong> {world_state['resources']}</p>
-            </div>
+""".encode('utf-8')
+        self._status_html_suffix = f"""            </div>
             <h3>How to Connect:</h3>
             <ul>
                 <li>Use <code>python test_client.py</code> to test the connection</li>
@@ -370,6 +491,18 @@ class Server:
         </html>
         """.encode('utf-8')
     
+    def _get_status_html(self):
+        """Generate a simple status HTML page, re-rendered only when its stats change."""
+        world_state = self._cached_world_state()
+        key = (world_state['tick'], world_state['resources'], len(self._ws_agent))
+        if self._status_html_cache[0] != key:
+            stats = f"""                <p><strong>Connected Agents:</strong> {key[2]}</p>
+                <p><strong>World Tick:</strong> {key[0]}</p>
+                <p><strong>Total Resources:</strong> {key[1]}</p>
+""".encode('utf-8')
+            self._status_html_cache = (key, self._status_html_prefix + stats + self._status_html_suffix)
+        return self._status_html_cache[1]
+    
     async def stop_server(self):
         """Stop the WebSocket server."""
         if self.server:
@@ -4,8 +4,9 @@ Basic tests for Proxiverse.
 Simple tests to validate the core functionality of entities and world engine.
 """
 
-from entities import Entity, Resource, Agent
+from entities import Entity, Resource, Agent, Res
 from world_engine import WorldEngine
+from economic_engine import EconomicEngine
 
 
 def test_entity_creation():
@@ -36,6 +37,13 @@ def test_resource_functionality():
     assert harvested == 70
     assert resource.quantity == 0
     assert resource.is_depleted()
+    
+    # Types without an inventory slot are rejected up front
+    try:
+        Resource(x=1, y=1, resource_type="wood", quantity=30)
+        assert False, "unknown resource type accepted"
+    except ValueError:
+        pass
     print("✓ Resource functionality passed")
 
 
@@ -65,6 +73,8 @@ def test_agent_inventory():
     assert agent.get_inventory_count("ORE") == 5
     assert agent.get_inventory_count("FUEL") == 3
     assert agent.get_inventory_count("COMPONENTS") == 2
+    assert agent.get_inventory_count(Res.COMPONENTS) == 2
+    assert agent.inventory == {"ORE": 5, "FUEL": 3, "COMPONENTS": 2}
     print("✓ Agent inventory passed")
 
 
@@ -88,6 +98,16 @@ def test_world_engine():
     assert len(entities) == 1
     assert entities[0] == agent
     
+    # Test type queries, including base-class matches
+    assert world.get_entities_by_type(Resource) == []
+    ore = Resource(x=0, y=0, resource_type="ORE", quantity=5)
+    world.add_entity(ore, 0, 0)
+    assert world.get_entities_by_type(Agent) == [agent]
+    assert world.count_entities_by_type(Entity) == 2
+    assert world.get_entities_by_type(Resource) == [ore]  # new type after an earlier query
+    world.remove_entity(ore)
+    assert world.get_entities_by_type(Resource) == []
+    
     # Test movement
     success = world.move_entity(agent, 3, 3)
     assert success
@@ -100,6 +120,213 @@ def test_world_engine():
     print("✓ World engine passed")
 
 
+def test_empty_cell_sampling():
+    """Test that free-cell sampling tracks occupancy through add/move/remove."""
+    print("Testing empty cell sampling...")
+    
+    world = WorldEngine(width=5, height=5)
+    agent = Agent(x=0, y=0, name="TestAgent")
+    world.add_entity(agent, 0, 0)
+    
+    cells = world.sample_empty_cells(100)
+    assert len(cells) == 24
+    assert len(set(cells)) == 24
+    assert (0, 0) not in cells
+    
+    world.move_entity(agent, 4, 4)
+    cells = world.sample_empty_cells(3)
+    assert len(cells) == 3
+    assert (4, 4) not in cells
+    assert (0, 0) in world.sample_empty_cells(24)
+    
+    world.remove_entity(agent)
+    assert len(world.sample_empty_cells(100)) == 25
+    print("✓ Empty cell sampling passed")
+
+
+def test_agent_collision():
+    """Test that agents cannot move onto each other but can share resource cells."""
+    print("Testing agent collision...")
+    
+    world = WorldEngine(width=5, height=5)
+    first = Agent(x=2, y=2, name="First")
+    second = Agent(x=2, y=2, name="Second")
+    world.add_entity(first, 2, 2)
+    world.add_entity(second, 2, 2)  # Agents may share the spawn cell
+    world.add_entity(Resource(x=3, y=2, resource_type="ORE", quantity=10), 3, 2)
+    
+    assert first.move(world, 1, 0)  # Onto the resource
+    assert not second.move(world, 1, 0)  # First is already there
+    assert second.move(world, 0, 1)
+    assert first.move(world, -1, 0)  # Spawn cell is free again
+    assert world.get_agent_at(2, 2) is first
+    assert world.get_agent_at(3, 2) is None
+    print("✓ Agent collision passed")
+
+
+def test_bulk_add():
+    """Test batch insertion skips invalid and duplicate entities."""
+    print("Testing bulk add...")
+    
+    world = WorldEngine(width=5, height=5)
+    ore = Resource(x=1, y=1, resource_type="ORE", quantity=10)
+    fuel = Resource(x=2, y=3, resource_type="FUEL", quantity=10)
+    outside = Resource(x=9, y=9, resource_type="ORE", quantity=10)
+    
+    assert world.add_entities([ore, fuel, outside, ore]) == 2
+    assert world.count_resources() == 2
+    assert world.get_entity_at(2, 3) == [fuel]
+    assert sorted(e.id for e in world.action_horizon(2, 2)) == sorted([ore.id, fuel.id])
+    assert world.action_horizon(0, 0) == [ore]
+    assert world.action_horizon(4, 0) == []
+    assert world.action_horizon(-3, 1) == []  # off-world centres must not wrap around
+    assert len(world.sample_empty_cells(100)) == 23
+    print("✓ Bulk add passed")
+
+
+def test_nearby_entities():
+    """Test that small and wide radius queries agree as entities move between tiles."""
+    print("Testing nearby entities...")
+    
+    world = WorldEngine(width=40, height=40)
+    agent = Agent(x=5, y=5, name="Scout")
+    near = Resource(x=7, y=6, resource_type="ORE", quantity=10)
+    far = Resource(x=30, y=30, resource_type="FUEL", quantity=10)
+    world.add_entities([agent, near, far])
+    
+    assert world.get_nearby_entities(6, 6, 1) == [agent, near]
+    assert sorted(e.id for e in world.get_nearby_entities(5, 5, 10)) == [agent.id, near.id]
+    assert len(world.get_nearby_entities(20, 20, 20)) == 3
+    
+    # Crossing a tile boundary keeps wide queries accurate
+    assert world.move_entity(agent, 28, 29)
+    assert sorted(e.id for e in world.get_nearby_entities(30, 30, 10)) == [agent.id, far.id]
+    world.remove_entity(far)
+    assert world.get_nearby_entities(30, 30, 10) == [agent]
+    
+    # A reused result list is cleared before each query
+    scratch = [far]
+    assert world.get_nearby_entities_into(6, 6, 1, scratch) is scratch
+    assert scratch == [near]
+    assert world.get_nearby_entities_into(30, 30, 10, scratch) == [agent]
+    print("✓ Nearby entities passed")
+
+
+def test_queued_effects():
+    """Test that queued actions apply at the tick boundary in agent ID order."""
+    print("Testing queued effects...")
+    
+    world = WorldEngine(width=5, height=5)
+    first = Agent(x=1, y=2, name="First")
+    second = Agent(x=3, y=2, name="Second")
+    ore = Resource(x=2, y=2, resource_type="ORE", quantity=15)
+    world.add_entities([first, second, ore])
+    
+    # Both agents race for the resource cell; the lower ID wins
+    assert second.queue_move(world, -1, 0)
+    assert first.queue_move(world, 1, 0)
+    assert not first.queue_move(world, -5, 0)
+    assert (first.x, second.x) == (1, 3)  # Nothing applied yet
+    
+    assert world.tick()
+    assert (first.x, first.y) == (2, 2)
+    assert (second.x, second.y) == (3, 2)
+    
+    assert first.queue_harvest(world)
+    assert first.queue_harvest(world)
+    assert world.tick()
+    assert first.get_inventory_count("ORE") == 15
+    assert world.count_resources() == 0
+    assert not world.tick()  # Nothing queued, nothing changed
+    
+    # A queued harvest fails once an earlier effect has moved the agent off the resource
+    fuel = Resource(x=2, y=2, resource_type="FUEL", quantity=15)
+    world.add_entity(fuel, 2, 2)
+    assert first.queue_move(world, 0, 1)
+    assert first.queue_harvest(world)
+    world.tick()
+    assert (first.x, first.y) == (2, 3)
+    assert first.get_inventory_count("FUEL") == 0
+    assert fuel.quantity == 15
+    
+    # Moves are computed from the pre-tick position, so a second one queued from
+    # the same origin is stale once the first has applied
+    assert first.queue_move(world, 1, 0)
+    assert first.queue_move(world, 1, 0)
+    assert world.apply_effects() == 1
+    assert (first.x, first.y) == (3, 3)
+    
+    # An immediate move in the meantime also makes a queued move stale
+    assert first.queue_move(world, 1, 0)
+    assert first.move(world, 0, 1)
+    world.tick()
+    assert (first.x, first.y) == (3, 4)
+    print("✓ Queued effects passed")
+
+
+def test_seeded_spawn():
+    """Test that resource spawning is repeatable for a given seed."""
+    print("Testing seeded spawn...")
+    
+    def spawn(seed):
+        world = WorldEngine(width=10, height=10)
+        EconomicEngine(world, seed=seed).spawn_resources(max_resources=20)
+        return sorted((r.x, r.y, r.resource_type, r.quantity)
+                      for r in world.get_entities_by_type(Resource))
+    
+    layout = spawn(42)
+    assert len(layout) == 20
+    assert len({(x, y) for x, y, _, _ in layout}) == 20
+    assert all(20 <= quantity <= 100 for _, _, _, quantity in layout)
+    assert spawn(42) == layout
+    print("✓ Seeded spawn passed")
+
+
+class _StubSocket:
+    """Collects the frames a Server sends, standing in for a client WebSocket."""
+    
+    def __init__(self):
+        self.sent = []
+    
+    async def send(self, message):
+        self.sent.append(message)
+
+
+def test_client_message_errors():
+    """Test that malformed client actions get the expected error replies."""
+    print("Testing client message errors...")
+    
+    import asyncio
+    import json
+    from server import Server
+    
+    world = WorldEngine(width=5, height=5)
+    server = Server(world, EconomicEngine(world))
+    agent = Agent(x=2, y=2, name="Client")
+    world.add_entity(agent, 2, 2)
+    websocket = _StubSocket()
+    server._ws_agent[websocket] = agent
+    
+    def reply_to(message):
+        asyncio.run(server.handle_client_message(websocket, json.dumps(message)))
+        return json.loads(websocket.sent.pop())
+    
+    # A non-string action is unknown, not a failed dict lookup
+    reply = reply_to({"action": ["x"]})
+    assert reply == {"type": "error", "message": "Unknown action: ['x']"}
+    
+    # Only params validation is reported as a params error
+    reply = reply_to({"action": "move", "params": {"dx": "1"}})
+    assert reply == {"type": "error", "message": "Invalid params: dx and dy must be integers"}
+    
+    def failing_craft(agent):
+        raise ValueError("boom")
+    server.economic_engine.craft_component = failing_craft
+    reply = reply_to({"action": "craft"})
+    assert reply == {"type": "error", "message": "Action failed: boom"}
+    print("✓ Client message errors passed")
+
+
 def run_all_tests():
     """Run all basic tests."""
     print("=" * 40)
@@ -111,6 +338,13 @@ def run_all_tests():
         test_resource_functionality()
         test_agent_inventory()
         test_world_engine()
+        test_empty_cell_sampling()
+        test_agent_collision()
+        test_bulk_add()
+        test_nearby_entities()
+        test_queued_effects()
+        test_client_message_errors()
+        test_seeded_spawn()
         
         print("\n" + "=" * 40)
         print("ALL TESTS PASSED! ✓")
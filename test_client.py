@@ -10,11 +10,63 @@ import json
 import websockets
 import logging
 
+try:
+    import orjson
+    
+    _loads = orjson.loads  # accepts str or bytes
+except ImportError:  # orjson is optional
+    _loads = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+async def send_commands(websocket, commands):
+    """Send all commands without waiting for their replies.
+    
+    Args:
+        websocket: The open WebSocket connection
+        commands: Command dicts to send, in order
+    """
+    # Encode everything up front so the send loop only writes frames
+    payloads = [json.dumps(command) for command in commands]
+    for i, payload in enumerate(payloads):
+        logger.info(f"Sending command {i+1}: {payload}")
+        await websocket.send(payload)
+
+
+async def receive_responses(websocket, expected: int):
+    """Log server replies until one has arrived for each command sent.
+    
+    Args:
+        websocket: The open WebSocket connection
+        expected: Number of action replies to wait for
+    """
+    replies = 0
+    while replies < expected:
+        try:
+            response = await asyncio.wait_for(websocket.recv(), timeout=3.0)
+        except asyncio.TimeoutError:
+            logger.info("No response from server within 3 seconds")
+            return
+        
+        # The action_confirmed reply carries the resulting game state inline
+        response_data = _loads(response)
+        logger.info(f"Server response: {response_data['type']}")
+        
+        if response_data['type'] in ('action_confirmed', 'game_state'):
+            if 'success' in response_data:
+                logger.info(f"Action succeeded: {response_data['success']}")
+                replies += 1
+            agent_state = response_data['agent_state']
+            logger.info(f"Agent position: ({agent_state['x']}, {agent_state['y']})")
+            logger.info(f"Agent inventory: {agent_state['inventory']}")
+        elif response_data['type'] == 'error':
+            logger.info(f"Server error: {response_data['message']}")
+            replies += 1
+
+
 async def test_client():
     """Test client that connects to the server and sends some basic commands."""
     uri = "ws://localhost:8765"
@@ -25,7 +77,7 @@ async def test_client():
         async with websockets.connect(uri) as websocket:
             # Wait for welcome message
             welcome_msg = await websocket.recv()
-            welcome_data = json.loads(welcome_msg)
+            welcome_data = _loads(welcome_msg)
             logger.info(f"Connected! Agent ID: {welcome_data.get('agent_id', 'Unknown')}")
             
             # Send some test commands
@@ -37,38 +89,13 @@ async def test_client():
                 {"action": "craft", "params": {}},                   # Craft component
             ]
             
-            for i, command in enumerate(commands):
-                logger.info(f"Sending command {i+1}: {command}")
-                await websocket.send(json.dumps(command))
-                
-                # Wait for responses after sending command
-                try:
-                    # Get first response (action_confirmed or game_state)
-                    response = await asyncio.wait_for(websocket.recv(), timeout=3.0)
-                    response_data = json.loads(response)
-                    logger.info(f"Server response: {response_data['type']}")
-                    
-                    if response_data['type'] == 'game_state':
-                        agent_state = response_data['agent_state']
-                        logger.info(f"Agent position: ({agent_state['x']}, {agent_state['y']})")
-                        logger.info(f"Agent inventory: {agent_state['inventory']}")
-                    elif response_data['type'] == 'action_confirmed':
-                        # Wait for the game_state update that follows
-                        try:
-                            state_response = await asyncio.wait_for(websocket.recv(), timeout=2.0)
-                            state_data = json.loads(state_response)
-                            if state_data['type'] == 'game_state':
-                                agent_state = state_data['agent_state']
-                                logger.info(f"Agent position: ({agent_state['x']}, {agent_state['y']})")
-                                logger.info(f"Agent inventory: {agent_state['inventory']}")
-                        except asyncio.TimeoutError:
-                            logger.info("No state update received after action confirmation")
-                            
-                except asyncio.TimeoutError:
-                    logger.info("No response from server within 3 seconds")
-                
-                # Longer pause between commands to ensure server processing
-                await asyncio.sleep(2)
+            # Send every command back to back while a second task reads the replies.
+            # The server handles a connection's messages in order, so moves and
+            # harvests still apply in sequence.
+            await asyncio.gather(
+                send_commands(websocket, commands),
+                receive_responses(websocket, len(commands))
+            )
             
             logger.info("Test commands completed. Staying connected for a few more seconds...")
             await asyncio.sleep(10)  # Stay connected longer
@@ -5,8 +5,12 @@ This module contains the core WorldEngine class that manages the simulation worl
 entity positioning, and the main simulation loop.
 """
 
-from typing import List, Optional, Dict, Set
-from entities import Entity, Resource, Agent
+import logging
+import random
+from typing import Iterable, List, Optional, Dict, Set
+from entities import Entity, Resource, Agent, KIND_AGENT
+
+logger = logging.getLogger(__name__)
 
 
 class WorldEngine:
@@ -17,6 +21,16 @@ class WorldEngine:
     with tick-based time progression.
     """
     
+    __slots__ = ('width', 'height', 'current_tick', 'revision', 'grid', 'entities',
+                 '_by_type', '_type_groups_cache', '_agent_at', '_pending', '_occupied',
+                 '_cell_index', '_buckets')
+    
+    # Entities are also bucketed into coarse (1 << BUCKET_SHIFT)-cell square tiles
+    BUCKET_SHIFT = 3
+    
+    # Ticks between "World ticked" log records
+    TICK_LOG_INTERVAL = 100
+    
     def __init__(self, width: int, height: int):
         """
         Initialize the world engine with specified dimensions.
@@ -29,19 +43,35 @@ class WorldEngine:
         self.height = height
         self.current_tick = 0
         
+        # Bumped whenever entities are added or removed, so callers can cache summaries
+        self.revision = 0
+        
         # Initialize the 2D world grid - each cell contains a list of entities
-        self.grid: List[List[List[Entity]]] = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                row.append([])  # Each cell is a list of entities
-            self.grid.append(row)
+        self.grid: List[List[List[Entity]]] = [[[] for _ in range(width)] for _ in range(height)]
         
         # Keep track of all entities by ID for efficient lookup
-        self.entities: Dict[str, Entity] = {}
+        self.entities: Dict[int, Entity] = {}
+        
+        # Entities grouped by concrete type, so type queries skip the full entity map
+        self._by_type: Dict[type, Dict[int, Entity]] = {}
         
-        # Track entity positions for efficient updates
-        self.entity_positions: Dict[str, tuple] = {}  # entity_id -> (x, y)
+        # Queried type -> its matching _by_type groups, reset when a new concrete type appears
+        self._type_groups_cache: Dict[type, List[Dict[int, Entity]]] = {}
+        
+        # Agent occupying each cell, for single-lookup collision checks
+        self._agent_at: Dict[tuple, Agent] = {}
+        
+        # Effects queued by agents, applied together at the next tick boundary
+        self._pending: List = []
+        
+        # Cells holding at least one entity, so free cells can be found without a grid scan
+        self._occupied: Set[tuple] = set()
+        
+        # Each entity's index within its grid cell list, for O(1) swap-and-pop removal
+        self._cell_index: Dict[int, int] = {}
+        
+        # Spatial hash of coarse tiles, so wide-radius queries only visit non-empty tiles
+        self._buckets: Dict[tuple, Dict[int, Entity]] = {}
     
     def is_valid_position(self, x: int, y: int) -> bool:
         """
@@ -68,24 +98,88 @@ class WorldEngine:
         Returns:
             True if entity was successfully added, False otherwise
         """
-        if not self.is_valid_position(x, y):
+        # Same test as is_valid_position, inlined on this hot path
+        if not (0 <= x < self.width and 0 <= y < self.height):
             return False
         
         if entity.id in self.entities:
             return False  # Entity already exists
         
-        # Update entity position
+        # Update entity position; the entity's own x/y is the world's record of it
         entity.move_to(x, y)
         
         # Add to grid
-        self.grid[y][x].append(entity)
+        cell = self.grid[y][x]
+        self._cell_index[entity.id] = len(cell)
+        cell.append(entity)
+        self._occupied.add((x, y))
         
         # Add to tracking dictionaries
         self.entities[entity.id] = entity
-        self.entity_positions[entity.id] = (x, y)
+        group = self._by_type.get(type(entity))
+        if group is None:
+            group = self._by_type[type(entity)] = {}
+            self._type_groups_cache.clear()
+        group[entity.id] = entity
+        shift = self.BUCKET_SHIFT
+        self._buckets.setdefault((x >> shift, y >> shift), {})[entity.id] = entity
+        if entity.KIND == KIND_AGENT:
+            self._agent_at.setdefault((x, y), entity)
+        self.revision += 1
         
         return True
     
+    def add_entities(self, entities: Iterable[Entity]) -> int:
+        """
+        Add several entities at once, each at its own (x, y) position.
+        
+        Equivalent to calling add_entity for each one, with the lookups hoisted
+        out of the loop for bulk spawning.
+        
+        Args:
+            entities: The entities to add
+            
+        Returns:
+            Number of entities that were added
+        """
+        grid = self.grid
+        occupied = self._occupied
+        all_entities = self.entities
+        by_type = self._by_type
+        cell_index = self._cell_index
+        buckets = self._buckets
+        shift = self.BUCKET_SHIFT
+        agent_at = self._agent_at
+        width, height = self.width, self.height
+        added = 0
+        
+        for entity in entities:
+            x, y = entity.x, entity.y
+            if not (0 <= x < width and 0 <= y < height) or entity.id in all_entities:
+                continue
+            
+            cell = grid[y][x]
+            cell_index[entity.id] = len(cell)
+            cell.append(entity)
+            occupied.add((x, y))
+            all_entities[entity.id] = entity
+            group = by_type.get(type(entity))
+            if group is None:
+                group = by_type[type(entity)] = {}
+                self._type_groups_cache.clear()
+            group[entity.id] = entity
+            bucket = buckets.get((x >> shift, y >> shift))
+            if bucket is None:
+                bucket = buckets[(x >> shift, y >> shift)] = {}
+            bucket[entity.id] = entity
+            if entity.KIND == KIND_AGENT:
+                agent_at.setdefault((x, y), entity)
+            added += 1
+        
+        if added:
+            self.revision += 1
+        return added
+    
     def remove_entity(self, entity: Entity) -> bool:
         """
         Remove an entity from the world.
@@ -100,15 +194,17 @@ class WorldEngine:
             return False
         
         # Get current position
-        x, y = self.entity_positions[entity.id]
+        x, y = entity.x, entity.y
         
         # Remove from grid
-        if entity in self.grid[y][x]:
-            self.grid[y][x].remove(entity)
+        self._remove_from_cell(entity, x, y)
+        self._untrack_agent(entity, x, y)
         
         # Remove from tracking dictionaries
         del self.entities[entity.id]
-        del self.entity_positions[entity.id]
+        self._by_type[type(entity)].pop(entity.id, None)
+        self._unbucket(entity, x, y)
+        self.revision += 1
         
         return True
     
@@ -124,27 +220,84 @@ class WorldEngine:
         Returns:
             True if entity was successfully moved, False otherwise
         """
-        if not self.is_valid_position(new_x, new_y):
+        # Same test as is_valid_position, inlined on this hot path
+        if not (0 <= new_x < self.width and 0 <= new_y < self.height):
             return False
         
         if entity.id not in self.entities:
             return False
         
         # Get current position
-        old_x, old_y = self.entity_positions[entity.id]
+        old_x, old_y = entity.x, entity.y
         
         # Remove from old position
-        self.grid[old_y][old_x].remove(entity)
+        self._remove_from_cell(entity, old_x, old_y)
+        self._untrack_agent(entity, old_x, old_y)
         
         # Add to new position
-        self.grid[new_y][new_x].append(entity)
+        cell = self.grid[new_y][new_x]
+        self._cell_index[entity.id] = len(cell)
+        cell.append(entity)
+        self._occupied.add((new_x, new_y))
+        if entity.KIND == KIND_AGENT:
+            self._agent_at.setdefault((new_x, new_y), entity)
+        
+        # Re-bucket only when the move crosses a tile boundary
+        shift = self.BUCKET_SHIFT
+        new_key = (new_x >> shift, new_y >> shift)
+        if new_key != (old_x >> shift, old_y >> shift):
+            self._unbucket(entity, old_x, old_y)
+            self._buckets.setdefault(new_key, {})[entity.id] = entity
         
         # Update tracking
         entity.move_to(new_x, new_y)
-        self.entity_positions[entity.id] = (new_x, new_y)
         
         return True
     
+    def _remove_from_cell(self, entity: Entity, x: int, y: int) -> None:
+        """Take an entity out of its grid cell by moving the cell's last entry into its slot."""
+        cell = self.grid[y][x]
+        index = self._cell_index.pop(entity.id)
+        last = cell.pop()
+        if last is not entity:
+            cell[index] = last
+            self._cell_index[last.id] = index
+        if not cell:
+            self._occupied.discard((x, y))
+    
+    def _unbucket(self, entity: Entity, x: int, y: int) -> None:
+        """Drop an entity from its spatial-hash tile, discarding the tile once empty."""
+        key = (x >> self.BUCKET_SHIFT, y >> self.BUCKET_SHIFT)
+        bucket = self._buckets[key]
+        del bucket[entity.id]
+        if not bucket:
+            del self._buckets[key]
+    
+    def _untrack_agent(self, entity: Entity, x: int, y: int) -> None:
+        """Drop an agent from the occupancy map, handing the cell to any agent left behind."""
+        if self._agent_at.get((x, y)) is not entity:
+            return
+        
+        del self._agent_at[(x, y)]
+        # Several agents can share the spawn cell
+        for other in self.grid[y][x]:
+            if other.KIND == KIND_AGENT:
+                self._agent_at[(x, y)] = other
+                break
+    
+    def get_agent_at(self, x: int, y: int) -> Optional[Agent]:
+        """
+        Get the agent occupying the specified position.
+        
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            
+        Returns:
+            An agent at the position, or None if there is none
+        """
+        return self._agent_at.get((x, y))
+    
     def get_entity_at(self, x: int, y: int) -> List[Entity]:
         """
         Get all entities at the specified position.
@@ -154,12 +307,48 @@ class WorldEngine:
             y: Y coordinate
             
         Returns:
-            List of entities at the position (empty list if none or invalid position)
+            List of entities at the position (empty list if none or invalid position).
+            This is the grid's own cell list, not a copy: read it, don't modify it,
+            and don't hold on to it across world changes.
         """
         if not self.is_valid_position(x, y):
             return []
         
-        return self.grid[y][x].copy()  # Return a copy to prevent external modification
+        return self.grid[y][x]
+    
+    def sample_empty_cells(self, count: int, rng: random.Random = random) -> List[tuple]:
+        """
+        Pick up to `count` distinct random cells that contain no entities.
+        
+        Mostly-empty worlds use rejection sampling against the occupancy set;
+        crowded worlds build the free-cell list once and sample from it.
+        
+        Args:
+            count: Number of cells wanted
+            rng: Random generator to draw from (defaults to the module-level one)
+            
+        Returns:
+            List of (x, y) tuples, shorter than `count` if the world is too full
+        """
+        total = self.width * self.height
+        free = total - len(self._occupied)
+        count = min(count, free)
+        if count <= 0:
+            return []
+        
+        if free - count >= 0.3 * total:
+            # Plenty of room left even after picking: expected < 4 draws per cell
+            chosen: Set[tuple] = set()
+            while len(chosen) < count:
+                cell = (rng.randrange(self.width), rng.randrange(self.height))
+                if cell not in self._occupied:
+                    chosen.add(cell)
+            return list(chosen)
+        
+        occupied = self._occupied
+        empty_cells = [(x, y) for x in range(self.width) for y in range(self.height)
+                       if (x, y) not in occupied]
+        return rng.sample(empty_cells, count)
     
     def get_entities_by_type(self, entity_type: type) -> List[Entity]:
         """
@@ -171,9 +360,37 @@ class WorldEngine:
         Returns:
             List of entities of the specified type
         """
-        # Create a copy of entities values to avoid modification during iteration
-        entities_copy = list(self.entities.values())
-        return [entity for entity in entities_copy if isinstance(entity, entity_type)]
+        groups = self._type_groups(entity_type)
+        if len(groups) == 1:
+            return list(groups[0].values())
+        return [entity for group in groups for entity in group.values()]
+    
+    def count_entities_by_type(self, entity_type: type) -> int:
+        """
+        Count the entities of a specific type without listing them.
+        
+        Args:
+            entity_type: The type of entity to count
+            
+        Returns:
+            Number of entities of the specified type, including subclasses
+        """
+        return sum(len(group) for group in self._type_groups(entity_type))
+    
+    def count_resources(self) -> int:
+        """Get the number of resources currently in the world."""
+        return self.count_entities_by_type(Resource)
+    
+    def _type_groups(self, entity_type: type) -> List[Dict[int, Entity]]:
+        """Get the per-type entity maps matching entity_type, subclasses included."""
+        # Groups are never dropped from _by_type, so a cached match list stays valid
+        # until a new concrete type is added
+        groups = self._type_groups_cache.get(entity_type)
+        if groups is None:
+            groups = self._type_groups_cache[entity_type] = [
+                group for group_type, group in self._by_type.items()
+                if issubclass(group_type, entity_type)]
+        return groups
     
     def get_nearby_entities(self, x: int, y: int, radius: int = 1) -> List[Entity]:
         """
@@ -187,17 +404,98 @@ class WorldEngine:
         Returns:
             List of entities within the radius
         """
-        nearby_entities = []
+        return self.get_nearby_entities_into(x, y, radius, [])
+    
+    def get_nearby_entities_into(self, x: int, y: int, radius: int, out: List[Entity]) -> List[Entity]:
+        """
+        Like get_nearby_entities, but fill a caller-owned list instead of a new one.
         
-        for dy in range(-radius, radius + 1):
-            for dx in range(-radius, radius + 1):
-                check_x, check_y = x + dx, y + dy
-                if self.is_valid_position(check_x, check_y):
-                    nearby_entities.extend(self.get_entity_at(check_x, check_y))
+        The list is cleared first, so a caller running many queries can keep
+        reusing one list rather than allocating a result per query.
         
-        return nearby_entities
+        Args:
+            x: Center X coordinate
+            y: Center Y coordinate
+            radius: Search radius
+            out: List to clear and fill with the results
+            
+        Returns:
+            `out`, now holding the entities within the radius
+        """
+        out.clear()
+        
+        if radius >= 1 << self.BUCKET_SHIFT:
+            self._nearby_from_buckets(x, y, radius, out)
+            return out
+        
+        # Clip the square to the world once instead of bounds-checking every cell.
+        # Ends are floored at 0 too, since a negative slice end counts from the back.
+        x0, x1 = max(0, x - radius), max(0, min(self.width, x + radius + 1))
+        y0, y1 = max(0, y - radius), max(0, min(self.height, y + radius + 1))
+        
+        for row in self.grid[y0:y1]:
+            for cell in row[x0:x1]:
+                out.extend(cell)
+        
+        return out
     
-    def tick(self, economic_engine=None) -> None:
+    def _nearby_from_buckets(self, x: int, y: int, radius: int, out: List[Entity]) -> None:
+        """Append the entities within radius of (x, y) to out by visiting spatial-hash tiles."""
+        shift = self.BUCKET_SHIFT
+        x0, x1 = max(0, x - radius), min(self.width - 1, x + radius)
+        y0, y1 = max(0, y - radius), min(self.height - 1, y + radius)
+        buckets = self._buckets
+        
+        for by in range(y0 >> shift, (y1 >> shift) + 1):
+            for bx in range(x0 >> shift, (x1 >> shift) + 1):
+                bucket = buckets.get((bx, by))
+                if bucket:
+                    out.extend(entity for entity in bucket.values()
+                               if x0 <= entity.x <= x1 and y0 <= entity.y <= y1)
+    
+    def queue_effect(self, effect) -> None:
+        """
+        Queue an effect to be applied at the start of the next tick.
+        
+        Args:
+            effect: An effect with an apply(world_engine) method, e.g. MoveEffect
+        """
+        self._pending.append(effect)
+    
+    def apply_effects(self) -> int:
+        """
+        Apply all queued effects in a deterministic order.
+        
+        Effects are ordered by agent ID (keeping each agent's own queue order), so when
+        two agents race for the same cell or resource, the lower ID wins.
+        
+        Returns:
+            Number of effects that changed the world
+        """
+        if not self._pending:
+            return 0
+        
+        pending, self._pending = self._pending, []
+        pending.sort(key=lambda effect: effect.agent_id)
+        return sum(1 for effect in pending if effect.apply(self))
+    
+    def action_horizon(self, x: int, y: int) -> List[Entity]:
+        """
+        Get all entities in the 3x3 block of cells centred on a position.
+        
+        Same as get_nearby_entities with radius 1, which reads the grid rows
+        directly, clipped to the world bounds.
+        
+        Args:
+            x: Center X coordinate
+            y: Center Y coordinate
+            
+        Returns:
+            List of entities in the centre cell and its eight neighbours
+        """
+        return self.get_nearby_entities(x, y, 1)
+    
+    def tick(self, economic_engine=None) -> bool:
         """
         Advance the simulation by one tick.
         
@@ -207,8 +505,15 @@ class WorldEngine:
         
         Args:
             economic_engine: Optional EconomicEngine instance for resource spawning
+        
+        Returns:
+            True if any effect was applied or entities were added or removed
         """
         self.current_tick += 1
+        revision = self.revision
+        
+        # Resolve actions queued since the previous tick
+        applied = self.apply_effects()
         
         # Spawn resources periodically if economic engine is provided
         if economic_engine and economic_engine.should_spawn_resources():
@@ -217,7 +522,10 @@ class WorldEngine:
         # Note: Agent actions are now processed by the server before tick()
         # The tick method focuses on world state updates and resource management
         
-        print(f"Tick {self.current_tick}: World ticked.")
+        if self.current_tick % self.TICK_LOG_INTERVAL == 0:
+            logger.info("Tick %d: World ticked.", self.current_tick)
+        
+        return applied > 0 or self.revision != revision
     
     def get_world_state(self) -> Dict:
         """
@@ -230,19 +538,19 @@ class WorldEngine:
             'tick': self.current_tick,
             'dimensions': (self.width, self.height),
             'entity_count': len(self.entities),
-            'agents': len(self.get_entities_by_type(Agent)),
-            'resources': len(self.get_entities_by_type(Resource))
+            'agents': self.count_entities_by_type(Agent),
+            'resources': self.count_resources()
         }
     
     def print_world_summary(self) -> None:
-        """Print a summary of the current world state."""
+        """Log a summary of the current world state."""
         state = self.get_world_state()
-        print(f"\n=== World Summary (Tick {state['tick']}) ===")
-        print(f"Dimensions: {state['dimensions'][0]}x{state['dimensions'][1]}")
-        print(f"Total Entities: {state['entity_count']}")
-        print(f"Agents: {state['agents']}")
-        print(f"Resources: {state['resources']}")
-        print("=" * 35)
+        logger.info("=== World Summary (Tick %d) ===", state['tick'])
+        logger.info("Dimensions: %dx%d", *state['dimensions'])
+        logger.info("Total Entities: %d", state['entity_count'])
+        logger.info("Agents: %d", state['agents'])
+        logger.info("Resources: %d", state['resources'])
+        logger.info("=" * 35)
     
     def __repr__(self) -> str:
         return f"WorldEngine(width={self.width}, height={self.height}, tick={self.current_tick}, entities={len(self.entities)})"